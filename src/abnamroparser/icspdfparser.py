@@ -1,9 +1,10 @@
 import datetime
 import re
-from .util import interval, first, money_format
-from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from .util import interval, money_format
+from collections import namedtuple
 from dataclasses import dataclass, field
-from moneyed import Currency, Money
+from moneyed import Currency, Money, get_currency
 from pypdf import PdfReader
 
 
@@ -50,10 +51,88 @@ MONTHS_SHORT = {
 }
 
 
+# Text objects that show up on the pages but carry no useful information.
+_USELESS_RE = re.compile(
+    "|".join(
+        [
+            # This text shows up every month:
+            r"Uw betalingen aan International Card Services BV zijn bijgewerkt",
+            r"Het totale saldo ad.*zal omstreeks",
+            r"(machtigingsnummer )?E[0-9]+ worden geïncasseerd",
+            # This text used to show up, but not anymore:
+            r"Wilt u een overboeking doen naar uw Card-rekening",
+            r"Diemen. Vermeld bij uw betaling altijd uw ICS-klantnummer",
+            # Advertisement:
+            r"Nu beschikbaar: Apple Pay! Voeg eenvoudig uw Card aan uw Apple Wallet toe in onze app.",
+            # Als u online een product besteld heeft, bent u er natuurlijk zuinig op. Maar een ongeluk zit in een klein hoekje. Betaal daarom altijd met uw ABN AMRO creditcard. Want dan heeft u een Aankoopverzekering. Kijk voor meer informatie en de voorwaarden op www.zekermetjecreditcard.nl.
+            r"Als u online een product besteld heeft, bent u er natuurlijk",
+            r"zuinig op. Maar een ongeluk zit in een klein hoekje",
+            r"daarom altijd met uw ABN AMRO creditcard",
+            r"een Aankoopverzekering. Kijk voor meer informatie",
+            r"voorwaarden op www.zekermetjecreditcard.nl",
+        ]
+    )
+)
+
+# The first two characters of each of the alternatives above.
+# Most text objects don't start with any of these, and a set lookup is much
+# cheaper than trying all the alternatives of the regex.
+# Keep this in sync with _USELESS_RE!
+_USELESS_PREFIXES = frozenset(
+    ["Uw", "He", "ma", "Wi", "Di", "Nu", "Al", "zu", "da", "ee", "vo"]
+    + ["E{}".format(digit) for digit in range(10)]
+)
+
+# All the statements are in euros. Resolving the Currency once saves Money()
+# from normalizing and looking up the code for every transaction.
+_EUR = get_currency("EUR")
+
+_BIJ_AF = {
+    "Bij": "+",
+    "Af": "-",
+}
+
+_CARD_RE = re.compile(r"Uw Card met als laatste vier cijfers ([0-9]+)")
+
+# For these PDF files, the current user matrix is always the identity.
+_IDENTITY_MATRIX = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+
+# Vertical ranges of each section of the page, for the first page and for the other pages.
+_Y_SECTIONS_FIRST_PAGE = (
+    # ICS company address and other information about that company.
+    interval(755, 9999),
+    # Date, number of pages, etc.
+    interval(665, 721),
+    # The list of transactions.
+    interval(126, 645),
+    # Credit limit and the minimal payment.
+    interval(0, 126),
+)
+_Y_SECTIONS_OTHER_PAGES = (
+    interval(0, 0),
+    interval(665, 721),
+    interval(0, 645),
+    interval(0, 0),
+)
+# The header row of the main table.
+_Y_TABLE_HEADER = interval(633, 645)
+
+
 @dataclass
 class Transaction:
     """Dataclass for each of the transactions from ICS credit card PDF files."""
 
+    # Same reason for __slots__ as in tsvparser.Transaction.
+    __slots__ = (
+        "card_number",
+        "date",
+        "descriptions",
+        "country_code",
+        "foreign_amount",
+        "exchange_rate",
+        "amount",
+    )
+
     # The last four digits of the card.
     card_number: int
 
@@ -148,20 +227,50 @@ def group_related_rows(table):
       ...
     StopIteration
     """
-    try:
-        it = iter(table)
-        buffer = []
-        while True:
-            row = next(it)
-            if isinstance(row[0], datetime.date) or row[0].startswith("Uw Card"):
-                if len(buffer) > 0:
-                    yield buffer
-                buffer = [row]
+    # Works on any iterable, yielding each group as soon as the next one starts.
+    buffer = []
+    for row in table:
+        # Each group starts at a transaction date or at a card header.
+        if isinstance(row[0], datetime.date) or row[0].startswith("Uw Card"):
+            if buffer:
+                yield buffer
+            buffer = [row]
+        else:
+            buffer.append(row)
+    if buffer:
+        yield buffer
+
+
+def _convert_pages(pages):
+    """Yields the rows from all pages, with the cells properly converted.
+
+    This is a generator, so each page can be processed (and freed) as soon as
+    it is available, without concatenating the tables of all pages first.
+    """
+    statement_date = None
+    for nr, page in enumerate(pages, start=1):
+        # Sanity check.
+        assert nr == page.page_nr, "Pages must be in order."
+
+        if nr == 1:
+            statement_date = page.date
+        else:
+            # Sanity check.
+            assert statement_date == page.date, "All pages must have the same date."
+
+        # Converting each row.
+        for raw_row in page.table_as_list:
+            if len(raw_row[0]) > Page.COLUMNS[0].max_length:
+                # Special case for text that expands across all columns.
+                assert all(t.strip() == "" for t in raw_row[1:])
+                yield [raw_row[0].strip()]
             else:
-                buffer.append(row)
-    except StopIteration:
-        if len(buffer) > 0:
-            yield buffer
+                # Converting each cell, if the cell is not empty.
+                # Same as page.convert_cell_text(), but without looking up the method by name.
+                yield [
+                    convert(cell) if cell and convert else cell
+                    for (cell, convert) in zip(map(str.strip, raw_row), page._converters)
+                ]
 
 
 def get_transactions_from_pages(pages):
@@ -206,37 +315,10 @@ def get_transactions_from_pages(pages):
     Transaction(card_number='5678', date=datetime.date(2023, 1, 3), descriptions=['Foreign stuff', 'Hello'], country_code='USA', foreign_amount=Money('6.05', 'USD'), exchange_rate=1.08229, amount=Money('-5.59', 'EUR'))
     Transaction(card_number='5678', date=datetime.date(2023, 1, 5), descriptions=['Is it over', 'Yet'], country_code='NLD', foreign_amount=None, exchange_rate=None, amount=Money('-1.99', 'EUR'))
     """
-    # Part 1: Concatenating the tables from all pages into one single table.
+    # Part 1: Streaming the rows from all pages, one page at a time.
     # This also involves properly converting the strings to a better format.
-    statement_date = None
-    table = []
-    for nr, page in enumerate(pages, start=1):
-        # Sanity check.
-        assert nr == page.page_nr, "Pages must be in order."
-
-        if nr == 1:
-            statement_date = page.date
-        else:
-            # Sanity check.
-            assert statement_date == page.date, "All pages must have the same date."
-
-        # Converting each row, and appending to our accumulator table.
-        for raw_row in page.table_as_list:
-            if len(raw_row[0]) > Page.COLUMNS[0].max_length:
-                # Special case for text that expands across all columns.
-                assert all(t.strip() == "" for t in raw_row[1:])
-                row = [raw_row[0].strip()]
-            else:
-                # Converting each cell, if the cell is not empty.
-                row = [
-                    page.convert_cell_text(cell, col.convert_method)
-                    for (cell, col) in zip(raw_row, Page.COLUMNS)
-                ]
-            table.append(row)
-
-    # Part 1 is finished.
-    # Now `tables` is a list of lists,
-    # being a concatenation of all the rows from all the pages.
+    # It's a generator, so Part 2 runs while the pages are still being read.
+    table = _convert_pages(pages)
 
     # Part 2: Generating the Transaction objects.
     card_number = None
@@ -248,7 +330,7 @@ def get_transactions_from_pages(pages):
         second = rows[1] if len(rows) > 1 else []
 
         if len(first) == len(second) == 1:
-            card_number = re.match(r"Uw Card met als laatste vier cijfers ([0-9]+)", first[0]).group(1)
+            card_number = _CARD_RE.match(first[0]).group(1)
             card_name = second[0]
         elif len(first) == 9 and len(second) in [0, 9]:
             if first[5] == first[6] == "" and len(second) == 0:
@@ -258,7 +340,7 @@ def get_transactions_from_pages(pages):
                     date=first[0],  # I'm discarding the "Datum boeking".
                     descriptions=[first[2], first[3]],
                     country_code=first[4],
-                    amount=Money(first[8] + first[7], "EUR"),
+                    amount=Money(first[8] + first[7], _EUR),
                     foreign_amount=None,
                     exchange_rate=None,
                 )
@@ -282,7 +364,7 @@ def get_transactions_from_pages(pages):
                     date=first[0],  # I'm discarding the "Datum boeking".
                     descriptions=[first[2], first[3]],
                     country_code=first[4],
-                    amount=Money(first[8] + first[7], "EUR"),
+                    amount=Money(first[8] + first[7], _EUR),
                     foreign_amount=Money(first[5], first[6]),
                     exchange_rate=float(second[3].replace(",", ".")),
                 )
@@ -295,6 +377,27 @@ def get_transactions_from_pages(pages):
 TableColumn = namedtuple("TableColumn", ["x_interval", "max_length", "name", "convert_method"])
 
 
+def build_column_lookup(columns):
+    """Returns a list mapping each integer x coordinate to the column index at that x.
+
+    The column x_interval bounds must be integers, so that `int(x)` always
+    falls into the same column as `x` itself (for non-negative `x`).
+    If the intervals overlap, the first column wins.
+
+    >>> build_column_lookup([
+    ...     TableColumn(interval(1, 3), 1, "a", None),
+    ...     TableColumn(interval(4, 6), 1, "b", None),
+    ...     TableColumn(interval(5, 7), 1, "c", None),
+    ... ])
+    [None, 0, 0, None, 1, 1, 2]
+    """
+    lookup = [None] * max(col.x_interval.high for col in columns)
+    for n, col in reversed(list(enumerate(columns))):
+        for x in range(col.x_interval.low, col.x_interval.high):
+            lookup[x] = n
+    return lookup
+
+
 @dataclass
 class Page:
     nr: int
@@ -320,9 +423,16 @@ class Page:
         TableColumn(interval(478, 530), 8, "Bedrag in euro's", "convert_amount"),
         TableColumn(interval(535, 539), 3, "Bij/Af", "convert_bij_af"),
     ]
+    # Column index for each integer x coordinate.
+    X_TO_COLUMN = build_column_lookup(COLUMNS)
 
     def __post_init__(self):
-        self.table = defaultdict(lambda: [""] * len(self.COLUMNS))
+        # Maps the y coordinate to the list of cells of that row.
+        self.table = {}
+        # The bound convert_method of each column, resolved once per page.
+        self._converters = [
+            getattr(self, col.convert_method) if col.convert_method else None for col in self.COLUMNS
+        ]
 
     def convert_date(self, text):
         """Converts a date from `dd mmm` format.
@@ -409,16 +519,15 @@ class Page:
                 except ValueError:
                     pass
 
+        # Picking whichever year is closer to the page date.
+        # Both candidates are exactly one year (365 or 366 days) apart, so the
+        # current year wins if the date is at most 182 days after the page date.
+        # At 183 days after it, both are equally close and the previous year wins.
         dt1 = datetime.date(y1, m, d)
-        dt2 = datetime.date(y2, m, d)
-
-        diff1 = self.date - dt1
-        diff2 = self.date - dt2
-
-        if abs(diff1.days) < abs(diff2.days):
+        if (self.date - dt1).days >= -182:
             return dt1
         else:
-            return dt2
+            return datetime.date(y2, m, d)
 
     @staticmethod
     def convert_bij_af(text):
@@ -429,10 +538,7 @@ class Page:
         >>> Page.convert_bij_af("Bij")
         '+'
         """
-        return {
-            "Bij": "+",
-            "Af": "-",
-        }[text]
+        return _BIJ_AF[text]
 
     @staticmethod
     def convert_amount(text):
@@ -525,6 +631,12 @@ class Page:
         ║04 jan│04 jan│Blah blah blah          │Fizzbuzz     │LUX│        │   │6,99    │Af ║
         """
         total_width = sum(c.max_length for c in self.COLUMNS) + len(self.COLUMNS) - 1
+        # A single format template for the whole row, instead of one ljust() per cell.
+        # The separator becomes part of the template, so its braces must be escaped.
+        escaped_sep = sep.replace("{", "{{").replace("}", "}}")
+        row_format = escaped_sep.join(
+            "{{:<{}}}".format(c.max_length) if padding else "{}" for c in self.COLUMNS
+        )
         lines = []
         for row in self.table_as_list:
             if len(row[0]) > self.COLUMNS[0].max_length:
@@ -533,12 +645,7 @@ class Page:
                 lines.append(row[0].ljust(total_width if padding else 0, " "))
             else:
                 # Normal case, each column is well-behaved.
-                lines.append(
-                    sep.join(
-                        cell.ljust(self.COLUMNS[i].max_length if padding else 0, " ")
-                        for (i, cell) in enumerate(row)
-                    )
-                )
+                lines.append(row_format.format(*row))
         return "\n".join(prefix + line + suffix for line in lines)
 
     def visitor(self, text, cm, tm, font_dict, font_size):
@@ -569,28 +676,7 @@ class Page:
             # Very small footer text that is not relevant.
             return
 
-        if re.match(
-            "|".join(
-                [
-                    # This text shows up every month:
-                    r"Uw betalingen aan International Card Services BV zijn bijgewerkt",
-                    r"Het totale saldo ad.*zal omstreeks",
-                    r"(machtigingsnummer )?E[0-9]+ worden geïncasseerd",
-                    # This text used to show up, but not anymore:
-                    r"Wilt u een overboeking doen naar uw Card-rekening",
-                    r"Diemen. Vermeld bij uw betaling altijd uw ICS-klantnummer",
-                    # Advertisement:
-                    r"Nu beschikbaar: Apple Pay! Voeg eenvoudig uw Card aan uw Apple Wallet toe in onze app.",
-                    # Als u online een product besteld heeft, bent u er natuurlijk zuinig op. Maar een ongeluk zit in een klein hoekje. Betaal daarom altijd met uw ABN AMRO creditcard. Want dan heeft u een Aankoopverzekering. Kijk voor meer informatie en de voorwaarden op www.zekermetjecreditcard.nl.
-                    r"Als u online een product besteld heeft, bent u er natuurlijk",
-                    r"zuinig op. Maar een ongeluk zit in een klein hoekje",
-                    r"daarom altijd met uw ABN AMRO creditcard",
-                    r"een Aankoopverzekering. Kijk voor meer informatie",
-                    r"voorwaarden op www.zekermetjecreditcard.nl",
-                ]
-            ),
-            text,
-        ):
+        if text[:2] in _USELESS_PREFIXES and _USELESS_RE.match(text):
             # Useless messages.
             return
 
@@ -604,17 +690,12 @@ class Page:
         y = tm[-1]  # y increases from bottom to top ↑
 
         # Sanity check.
-        assert cm == [1.0, 0.0, 0.0, 1.0, 0.0, 0.0], "Has the PDF format changed?" + print_debug()
+        assert cm == _IDENTITY_MATRIX, "Has the PDF format changed?" + print_debug()
         assert tm == [1.0, 0.0, 0.0, 1.0, x, y], "Has the PDF format changed?" + print_debug()
 
-        # ICS company address and other information about that company.
-        y_company_info = interval(755, 9999) if self.nr == 1 else interval(0, 0)
-        # Date, number of pages, etc.
-        y_statement_info = interval(665, 721) if self.nr == 1 else interval(665, 721)
-        # The list of transactions.
-        y_main_table = interval(126, 645) if self.nr == 1 else interval(0, 645)
-        # Credit limit and the minimal payment.
-        y_footer_info = interval(0, 126) if self.nr == 1 else interval(0, 0)
+        y_company_info, y_statement_info, y_main_table, y_footer_info = (
+            _Y_SECTIONS_FIRST_PAGE if self.nr == 1 else _Y_SECTIONS_OTHER_PAGES
+        )
 
         if y in y_company_info:
             # ICS company name, address, telephone, website, etc.
@@ -658,17 +739,20 @@ class Page:
             # |       | X=445 | Currency code                                    |
             # | X=479 | X=... | Bedrag in euro's         (data is right-aligned) |
             # |       |X=537±1| Bij/Af (credit/debit)    (data is right-aligned) |
-            y_header = interval(633, 645)
-            if y in y_header:
+            if y in _Y_TABLE_HEADER:
                 # Ignoring the table header cells.
                 return
 
             # If you need debugging:
             # print("X={:>6} Y={:>6} {!r}".format(x, y, text))
 
-            column = first(n for n, col in enumerate(self.COLUMNS) if x in col.x_interval)
+            xi = int(x)
+            column = self.X_TO_COLUMN[xi] if 0 <= xi < len(self.X_TO_COLUMN) else None
             assert column is not None, "Unmatched column" + print_debug()
-            self.table[y][column] = text
+            row = self.table.get(y)
+            if row is None:
+                row = self.table[y] = [""] * len(self.COLUMNS)
+            row[column] = text
 
         elif y in y_footer_info:
             # Dit product valt onder het depositogarantiestelsel. Meer informatie vindt u op www.icscards.nl/abnamro/info/depositogarantiestelsel en op het informatieblad dat u jaarlijks ontvangt.
@@ -681,11 +765,45 @@ class Page:
 
 def read_ics_pdf(filename):
     reader = PdfReader(filename)
-    pages = []
+    yield from get_transactions_from_pages(_read_pages(reader))
+
+
+def _read_pages(reader):
+    """Yields one Page for each PDF page, extracting the text only when needed."""
     for nr, page in enumerate(reader.pages, start=1):
         p = Page(nr)
-        pages.append(p)
         # Ignoring the returned string from extract_text().
         page.extract_text(visitor_text=p.visitor)
+        yield p
+
 
-    yield from get_transactions_from_pages(pages)
+def _read_ics_pdf_as_list(filename):
+    # Generators can't be sent back from a worker process.
+    return list(read_ics_pdf(filename))
+
+
+def read_ics_pdfs(filenames, workers=None):
+    """Reads several PDF files in parallel, yielding all their transactions.
+
+    Each file is parsed in a separate process, as the text extraction is
+    CPU-bound. The transactions are yielded in the same order as the files.
+    `workers` is the maximum number of processes (default: number of CPUs).
+
+    On platforms that spawn the worker processes (the default on Windows and
+    macOS), the main script is imported again by each worker. So, the call
+    must be guarded by `if __name__ == "__main__":`, as usual for
+    multiprocessing code.
+
+    All files are submitted at once. Closing the generator early cancels the
+    files that haven't started yet, but still waits for the running ones.
+
+    >>> list(read_ics_pdfs([]))
+    []
+    """
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        for transactions in executor.map(_read_ics_pdf_as_list, filenames):
+            yield from transactions
+    finally:
+        # If the caller stops iterating early, the remaining files are not parsed.
+        executor.shutdown(cancel_futures=True)
@@ -1,34 +1,14 @@
-import csv
 import datetime
+import functools
+import json
 import os.path
 import re
-from .util import filter_comments, money_format
+from .util import decimal_format, filter_comments, money_format
 from collections import namedtuple
 from dataclasses import dataclass
+from decimal import Decimal
 from moneyed import Currency, Money
 
-try:
-    from itertools import batched
-except ImportError:
-    from itertools import islice
-
-    # It was introduced in Python 3.12
-    def batched(iterable, n):
-        """Returns tuples of batched items from the iterable.
-
-        It was introduced in Python 3.12.
-        This code here just replicates the behavior for older versions.
-
-        >>> list(batched("ABCDEFG", 3))
-        [('A', 'B', 'C'), ('D', 'E', 'F'), ('G',)]
-        """
-        if n < 1:
-            raise ValueError("n must be at least one")
-        it = iter(iterable)
-        while batch := tuple(islice(it, n)):
-            yield batch
-
-
 # The column order in the XLS is:
 # HEADERS = [
 #     "accountNumber",
@@ -57,6 +37,37 @@ HEADERS = [
 # This named tuple contains the raw data directly read from the TSV file.
 RowTuple = namedtuple("RowTuple", HEADERS)
 
+# Precompiled regular expressions used while parsing the description.
+# They are called once (or more) per row, so it's better to compile them only once.
+_RE_BEA_LEGACY = re.compile(r"^(BEA) +NR:([^ ]+) +([0-9./:]+)$")
+_RE_BEA_GEA_NR = re.compile(r"NR:([^, ]+)[, ]+([0-9./:]+) *")
+_RE_SPACES = re.compile(r" +")
+
+# Known keys from the SEPA description format, each one followed by `: `.
+# Note: It may be worth matching them case-insensitively if parsing the
+# description from MT940 files, as those are ALL CAPS.
+_SEPA_KEYS = frozenset(
+    ["Incassant", "BIC", "Naam", "Machtiging", "Omschrijving", "IBAN", "Kenmerk", "Voor"]
+)
+
+# All the separators accepted by parse_nr_datetime() are translated to `.`.
+_NR_SEPARATORS = str.maketrans("-:/", "...")
+
+# Known keys from the slash-separated description format.
+_SLASH_KEYS = frozenset(["TRTP", "CSID", "NAME", "REMI", "MARF", "EREF", "IBAN", "BIC", "ORDP", "ID"])
+# Those keys mapped to the same names used in the other formats.
+# The missing ones (ORDP and ID) are useless, so they are discarded.
+_SLASH_KEY_MAP = {
+    "TRTP": "type",
+    "CSID": "Incassant",
+    "NAME": "Naam",
+    "REMI": "Omschrijving",
+    "MARF": "Machtiging",
+    "EREF": "Kenmerk",
+    "IBAN": "IBAN",
+    "BIC": "BIC",
+}
+
 
 @dataclass
 class Transaction:
@@ -67,6 +78,22 @@ class Transaction:
     This class includes a few convenience methods and properties.
     """
 
+    # There is one instance per row, so __slots__ saves quite some memory.
+    # (`@dataclass(slots=True)` would be nicer, but it requires Python 3.10.)
+    __slots__ = (
+        "account",
+        "date",
+        "order",
+        "currency",
+        "amount",
+        "start_saldo",
+        "end_saldo",
+        "description",
+        # Cache for the `desc` property.
+        "_desc_str",
+        "_desc",
+    )
+
     # The account number.
     account: int
 
@@ -137,14 +164,34 @@ class Transaction:
         True
         >>> a == build_row("description")
         True
+
+        The hash is consistent with the equality, so duplicated transactions
+        can be removed by using a set (or a dict).
+
+        >>> len({a, build_row("order"), build_row("description")})
+        1
+        """
+        if not isinstance(other, Transaction):
+            return NotImplemented
+        return self._key == other._key
+
+    def __hash__(self):
+        return hash(self._key)
+
+    @property
+    def _key(self):
+        """Tuple with the fields used for comparison and hashing.
+
+        Comparing plain values (int, date, str, Decimal) is faster than
+        comparing Currency and Money objects.
         """
         return (
-            self.account == other.account
-            and self.date == other.date
-            and self.currency == other.currency
-            and self.amount == other.amount
-            and self.start_saldo == other.start_saldo
-            and self.end_saldo == other.end_saldo
+            self.account,
+            self.date,
+            self.currency.code,
+            self.amount.amount,
+            self.start_saldo.amount,
+            self.end_saldo.amount,
         )
 
     @property
@@ -204,6 +251,7 @@ class Transaction:
         }
 
 
+@functools.lru_cache(maxsize=4096)
 def rejoin_description(s):
     """Removes the extraneous space characters inserted about every 64 chars.
 
@@ -248,13 +296,45 @@ def rejoin_description(s):
         # It's annoying.
         head = s[:32]
         assert s[32] == " ", "Expected space at the 32th position"
-        parts = re.findall(r".{1,64} ?", s[33:].rstrip())
-        assert all(
-            len(p) == 65 for p in parts[:-1]
+        # Each part has 64 chars followed by the extraneous space
+        # (except the last one).
+        tail = s[33:].rstrip()
+        parts = [tail[i : i + 65] for i in range(0, len(tail), 65)]
+        assert all(p[64:] == " " for p in parts[:-1]) and all(
+            len(p) <= 64 for p in parts[-1:]
         ), "Expected all parts to have exactly 65 chars (except that last one)"
         return "".join([head, *[p[:64] for p in parts]])
 
 
+def parse_amount(s):
+    """Given an amount string from the TSV file, returns a Decimal object.
+
+    The TSV file uses `,` as the decimal separator, and no thousands separator.
+    Passing a Decimal to Money skips its own conversion from a string.
+
+    >>> parse_amount("-1234,56")
+    Decimal('-1234.56')
+    """
+    return Decimal(s.replace(",", "."))
+
+
+def parse_yyyymmdd(s):
+    """Given a date string in `YYYYMMDD` format, returns a date object.
+
+    It's the same as `strptime(s, "%Y%m%d").date()`, but much faster.
+
+    >>> parse_yyyymmdd("20231231")
+    datetime.date(2023, 12, 31)
+    >>> parse_yyyymmdd("20231231x")
+    Traceback (most recent call last):
+      ...
+    AssertionError: Expected YYYYMMDD date: '20231231x'
+    """
+    assert len(s) == 8 and s.isdigit(), "Expected YYYYMMDD date: {!r}".format(s)
+    return datetime.date(int(s[0:4]), int(s[4:6]), int(s[6:8]))
+
+
+@functools.lru_cache(maxsize=2048)
 def parse_nr_datetime(s):
     """Given a datetime string from the bank, returns a proper datetime object.
 
@@ -265,8 +345,10 @@ def parse_nr_datetime(s):
     datetime.datetime(2023, 12, 31, 23, 59)
     >>> parse_nr_datetime("31.12.23/23:59")
     datetime.datetime(2023, 12, 31, 23, 59)
+    >>> parse_nr_datetime("31-12-23/23-59")
+    datetime.datetime(2023, 12, 31, 23, 59)
     """
-    parts = re.split("[-:./]", s.strip())
+    parts = s.strip().translate(_NR_SEPARATORS).split(".")
     dd, mm, yy, HH, MM = [int(p) for p in parts]
     return datetime.datetime(2000 + yy, mm, dd, HH, MM)
 
@@ -745,138 +827,267 @@ def parse_description(s):
       "type": "BEA, Betaalpas"
     }
 
+    """
+    # Bank statements have plenty of repeated descriptions (monthly fees,
+    # recurring payments, subscriptions...), so the parsed result is memoized.
+    # A shallow copy is returned, so the cached dict can't be modified by the caller.
+    data, is_known = _parse_description(s)
+    if not is_known:
+        # Reported here, on every call, as cache hits don't reach the parser.
+        print("Unexpected format! {!r}".format(s))
+    return dict(data)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_description(s):
+    """Memoized implementation of parse_description().
+
+    Returns the parsed dict, and whether the format was recognized.
     """
     if s.startswith("/"):
-        parts = []
-        for p in s[1:].split("/"):
-            if len(parts) % 2 == 0:
-                if re.fullmatch(r"TRTP|CSID|NAME|REMI|MARF|EREF|IBAN|BIC|ORDP|ID", p):
-                    parts.append(p)
-                else:
-                    parts.append(parts.pop() + "/" + p)
-            else:
-                parts.append(p)
-        key_map = {
-            "TRTP": "type",
-            "CSID": "Incassant",
-            "NAME": "Naam",
-            "REMI": "Omschrijving",
-            "MARF": "Machtiging",
-            "EREF": "Kenmerk",
-            "IBAN": "IBAN",
-            "BIC": "BIC",
-            "ORDP": "",
-            "ID": "",
-        }
-        data = {key_map[k]: v.rstrip() for (k, v) in batched(parts, 2) if key_map[k] != ""}
-        if data["type"] == "iDEAL":
-            # To make it consistent with the other format.
-            data["type"] = "SEPA iDEAL"
-        return {
-            **data,
-        }
+        return _parse_slashes(s), True
     else:
         head = s[:32].rstrip()
         tail = s[32:].rstrip()
-        if head.startswith("ABN AMRO Bank"):
-            # Bank fees.
-            parts = re.findall(r".{1,32}", tail)
-            costs = {
-                k: v.replace(",", ".")
-                for (k, v) in (re.fullmatch(r"^(.*[^ ]) +([-0-9,.]+)$", p).groups() for p in parts)
-            }
-            return {
-                "type": head,
-                **costs,
-            }
-        elif re.match(r"^BEA ", head):
-            # Legacy, old format for in-person payments.
-            name_and_card = tail[0:32]
-            location = tail[32:64]
-            suffix = tail[64:]
-
-            type, nr, dtstr = re.fullmatch(r"^(BEA) +NR:([^ ]+) +([0-9./:]+)$", head).groups()
-            name, _, pas = name_and_card.partition(",PAS")
-            dt = parse_nr_datetime(dtstr)
-            return {
-                "type": type,
-                "datetime": dt.isoformat(),
-                "NR": nr,
-                "Naam": name.rstrip(),
-                "card": pas.rstrip(),
-                "location": location.rstrip(),
-                "suffix": suffix.rstrip(),
-            }
-
-        elif re.match(r"^(BEA|GEA), ", head):
-            # Newer format for payments and ATM.
-            name_and_card = tail[0:32]
-            nr_and_date = tail[32:64]
-            location = tail[64:96]
-            suffix = tail[96:]
-
-            name, _, pas = name_and_card.partition(",PAS")
-            nr, dtstr = re.fullmatch(r"^NR:([^, ]+)[, ]+([0-9./:]+) *", nr_and_date).groups()
-            dt = parse_nr_datetime(dtstr)
-
-            return {
-                "type": head,
-                "datetime": dt.isoformat(),
-                "NR": nr,
-                "Naam": name.rstrip(),
-                "card": pas.rstrip(),
-                "location": location.rstrip(),
-                "suffix": suffix.rstrip(),
-            }
-        elif re.match(r"^SEPA ", head):
-            # Online transactions.
-            parts = []
-            for thirtytwo in re.findall(r".{1,32}", tail):
-                # Human-readable:
-                #     Naam, Omschrijving
-                # Readable, but mostly useless:
-                #     Voor
-                # Codes for machines:
-                #     Incassant, BIC, Machtiging, IBAN, Kenmerk
-                if match := re.fullmatch(
-                    r"^(Incassant|BIC|Naam|Machtiging|Omschrijving|IBAN|Kenmerk|Voor): (.+)",
-                    thirtytwo,
-                    # Note: It may be worth adding the `re.I` flag if using
-                    # this function against the description from MT940 files,
-                    # as those are ALL CAPS.
-                ):
-                    parts.append((match.group(1), match.group(2)))
-                else:
-                    key, value = parts.pop()
-                    parts.append((key, value + thirtytwo))
-            return {
-                "type": head,
-                **{k: v.strip() for (k, v) in parts},
-            }
-        elif re.match(r"^CREDIT INTEREST", head):
-            # Legacy, old format for savings account interest.
-            return {
-                "type": "Basic interest",
-                "description": tail,  # Empty in this case.
-            }
-        elif re.match(r"^Basic interest", head):
-            # Newer format for savings account interest.
-            return {
-                "type": head,
-                "description": re.sub(r" +", " ", tail),
-            }
-        elif re.match(r"^(Maandpremie |Uitbetaling pakketkorting|PAKKETVERZ\. POLISNR\.)", head):
-            # Legacy, old format for insurance costs.
-            return {
-                "type": "legacy insurance",
-                "description": re.sub(r" +", " ", head + " " + tail),
-            }
+        # A single dict lookup on the first four chars picks the parser.
+        prefix, parser = _HEAD_PARSERS.get(head[:4], ("", _parse_other))
+        if not head.startswith(prefix):
+            parser = _parse_other
+        return parser(s, head, tail), parser is not _parse_other
+
+
+def _parse_slashes(s):
+    """Parses the slash-separated format of the description.
+
+    >>> parse_description("/TRTP/SEPA Incasso/NAME/Foo/Bar/REMI/Hello")
+    {'type': 'SEPA Incasso', 'Naam': 'Foo/Bar', 'Omschrijving': 'Hello'}
+    >>> parse_description("/FOO/bar/TRTP/x")
+    Traceback (most recent call last):
+      ...
+    AssertionError: Unexpected key: 'FOO'
+    >>> parse_description("/TRTP/x/NAME")
+    Traceback (most recent call last):
+      ...
+    AssertionError: Missing value for key: 'NAME'
+    """
+    # Single forward pass over the tokens, building the dict on the fly.
+    # The token after a key is always its value. After that, any token
+    # that isn't a known key is part of the value (which contains slashes).
+    data = {}
+    key = value = None
+    for p in s[1:].split("/"):
+        if key is None:
+            assert p in _SLASH_KEYS, "Unexpected key: {!r}".format(p)
+            key = p
+        elif value is None:
+            value = p
+        elif p in _SLASH_KEYS:
+            if name := _SLASH_KEY_MAP.get(key):
+                data[name] = value.rstrip()
+            key, value = p, None
         else:
-            print("Unexpected format! {!r}".format(s))
-            return {
-                "type": head,
-                "description": tail,
-            }
+            value += "/" + p
+    assert value is not None, "Missing value for key: {!r}".format(key)
+    if name := _SLASH_KEY_MAP.get(key):
+        data[name] = value.rstrip()
+    if data["type"] == "iDEAL":
+        # To make it consistent with the other format.
+        data["type"] = "SEPA iDEAL"
+    return {
+        **data,
+    }
+
+
+def _parse_bank_fees(s, head, tail):
+    """Parses the bank fees.
+
+    >>> head = "ABN AMRO Bank N.V.".ljust(32)
+    >>> parse_description(head + "Debit card                  0,60Basic Package               2,90")
+    {'type': 'ABN AMRO Bank N.V.', 'Debit card': '0.60', 'Basic Package': '2.90'}
+    >>> parse_description(head + "Debit card                  0,6 0Basic Package              2,90")
+    Traceback (most recent call last):
+      ...
+    AssertionError: Unexpected bank fee: 'Debit card                  0,6 '
+    """
+    # Each fee is in a fixed-width 32-char column.
+    parts = [tail[i : i + 32] for i in range(0, len(tail), 32)]
+    costs = {}
+    for p in parts:
+        # The amount is after the last space, right-aligned in the column.
+        name, _, amount = p.rpartition(" ")
+        name = name.rstrip()
+        # Sanity check, so misaligned columns fail instead of producing garbage.
+        is_number = amount != "" and amount.strip("-0123456789,.") == ""
+        assert name and is_number, "Unexpected bank fee: {!r}".format(p)
+        costs[name] = amount.replace(",", ".")
+    return {
+        "type": head,
+        **costs,
+    }
+
+
+def _parse_bea_legacy(s, head, tail):
+    """Parses the legacy, old format for in-person payments."""
+    name_and_card = tail[0:32]
+    location = tail[32:64]
+    suffix = tail[64:]  # The tail is already stripped.
+
+    type, nr, dtstr = _RE_BEA_LEGACY.fullmatch(head).groups()
+    name, _, pas = name_and_card.partition(",PAS")
+    dt = parse_nr_datetime(dtstr)
+    return {
+        "type": type,
+        "datetime": dt.isoformat(),
+        "NR": nr,
+        "Naam": name.rstrip(),
+        "card": pas.rstrip(),
+        "location": location.rstrip(),
+        "suffix": suffix,
+    }
+
+
+def _parse_bea_gea(s, head, tail):
+    """Parses the newer format for payments and ATM.
+
+    The columns have fixed widths, so a misaligned row fails instead of being
+    silently misparsed.
+
+    >>> head = "BEA, Betaalpas".ljust(32)
+    >>> parse_description(head + "Foo,PAS123   b".ljust(32) + "NR:0ABC0D, 01.02.23/14:15")["card"]
+    '123   b'
+    >>> parse_description(head + " " + "Foo,PAS123".ljust(32) + "NR:0ABC0D, 01.02.23/14:15")
+    Traceback (most recent call last):
+      ...
+    AttributeError: 'NoneType' object has no attribute 'groups'
+    """
+    name_and_card = tail[0:32]
+    nr_and_date = tail[32:64]
+    location = tail[64:96]
+    suffix = tail[96:]  # The tail is already stripped.
+
+    name, _, pas = name_and_card.partition(",PAS")
+    nr, dtstr = _RE_BEA_GEA_NR.fullmatch(nr_and_date).groups()
+    dt = parse_nr_datetime(dtstr)
+
+    return {
+        "type": head,
+        "datetime": dt.isoformat(),
+        "NR": nr,
+        "Naam": name.rstrip(),
+        "card": pas.rstrip(),
+        "location": location.rstrip(),
+        "suffix": suffix,
+    }
+
+
+def _parse_sepa(s, head, tail):
+    """Parses the online transactions."""
+    data = {"type": head}
+    key = value = None
+    for i in range(0, len(tail), 32):
+        thirtytwo = tail[i : i + 32]
+        # Human-readable:
+        #     Naam, Omschrijving
+        # Readable, but mostly useless:
+        #     Voor
+        # Codes for machines:
+        #     Incassant, BIC, Machtiging, IBAN, Kenmerk
+        new_key, _, new_value = thirtytwo.partition(": ")
+        if new_value and new_key in _SEPA_KEYS:
+            # The previous value is complete, and can be stored.
+            if key is not None:
+                data[key] = value.strip()
+            key, value = new_key, new_value
+        else:
+            # Continuation of the previous value.
+            value += thirtytwo
+    if key is not None:
+        data[key] = value.strip()
+    return data
+
+
+def _parse_credit_interest(s, head, tail):
+    """Parses the legacy, old format for savings account interest."""
+    return {
+        "type": "Basic interest",
+        "description": tail,  # Empty in this case.
+    }
+
+
+def _parse_basic_interest(s, head, tail):
+    """Parses the newer format for savings account interest."""
+    return {
+        "type": head,
+        "description": _RE_SPACES.sub(" ", tail),
+    }
+
+
+def _parse_insurance(s, head, tail):
+    """Parses the legacy, old format for insurance costs.
+
+    Runs of spaces are collapsed, but a single trailing space is kept:
+
+    >>> _parse_insurance("", "Maandpremie 12345", "")["description"]
+    'Maandpremie 12345 '
+    """
+    return {
+        "type": "legacy insurance",
+        "description": _RE_SPACES.sub(" ", head + " " + tail),
+    }
+
+
+def _parse_other(s, head, tail):
+    """Fallback for unknown formats, which parse_description() reports on every call.
+
+    >>> s = "Hello".ljust(32) + "world"
+    >>> parse_description(s) == parse_description(s)
+    Unexpected format! 'Hello                           world'
+    Unexpected format! 'Hello                           world'
+    True
+    """
+    return {
+        "type": head,
+        "description": tail,
+    }
+
+
+# The parser for each kind of description, keyed by the first four chars.
+# Each value is the full prefix that must match, and the parser function.
+_HEAD_PARSERS = {
+    "ABN ": ("ABN AMRO Bank", _parse_bank_fees),
+    "BEA ": ("BEA ", _parse_bea_legacy),
+    "BEA,": ("BEA, ", _parse_bea_gea),
+    "GEA,": ("GEA, ", _parse_bea_gea),
+    "SEPA": ("SEPA ", _parse_sepa),
+    "CRED": ("CREDIT INTEREST", _parse_credit_interest),
+    "Basi": ("Basic interest", _parse_basic_interest),
+    "Maan": ("Maandpremie ", _parse_insurance),
+    "Uitb": ("Uitbetaling pakketkorting", _parse_insurance),
+    "PAKK": ("PAKKETVERZ. POLISNR.", _parse_insurance),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _get_currency(code):
+    """Returns a shared Currency object for the three-letter code.
+
+    Usually all the rows have the same currency, so there is no point in
+    creating a new object for each row.
+
+    >>> _get_currency("EUR") is _get_currency("EUR")
+    True
+    """
+    return Currency(code)
+
+
+def _read_rows(file):
+    """Yields the row number (starting at 1) and the RowTuple for each row."""
+    # The TSV files have no quoting nor escaping, so a plain split is enough
+    # (and faster than the csv module).
+    order = 0
+    for line in filter_comments(file):
+        order += 1
+        yield order, RowTuple._make(line.rstrip("\r\n").split("\t"))
 
 
 def read_tsv(file):
@@ -888,24 +1099,59 @@ def read_tsv(file):
 
     For ease-of-use, it also ignores empty lines and comment lines.
     """
-    order = 0
-    for r in csv.reader(filter_comments(file), dialect="excel-tab"):
-        row = RowTuple(*r)
-        order += 1
-        cur = Currency(row.mutationcode)
+    for order, row in _read_rows(file):
+        cur = _get_currency(row.mutationcode)
         yield Transaction(
             account=int(row.accountNumber),
-            date=datetime.datetime.strptime(row.transactiondate, "%Y%m%d").date(),
+            date=parse_yyyymmdd(row.transactiondate),
             # Ignoring row.valuedate.
             order=order,
             currency=cur,
-            amount=Money(row.amount.replace(",", "."), cur),
-            start_saldo=Money(row.startsaldo.replace(",", "."), cur),
-            end_saldo=Money(row.endsaldo.replace(",", "."), cur),
+            amount=Money(parse_amount(row.amount), cur),
+            start_saldo=Money(parse_amount(row.startsaldo), cur),
+            end_saldo=Money(parse_amount(row.endsaldo), cur),
             description=rejoin_description(row.description),
         )
 
 
+def read_tsv_as_json_like(file):
+    """Reads and parses a TSV file, generating JSON-serializable dicts.
+
+    It generates the same dicts as `Transaction.as_json_like`, but builds them
+    directly from the raw strings, skipping the intermediate Transaction,
+    Money and date objects. Useful if all you want is to export the data.
+
+    >>> lines = [
+    ...     "\\t".join([
+    ...         "123456789", "EUR", "20231231", "1025,00", "1000,00", "20231231", "-25,00",
+    ...         "/TRTP/SEPA OVERBOEKING/IBAN/NL01ABNA0123456789/BIC/ABNANL2A/NAME/Foo/EREF/0123",
+    ...     ]),
+    ... ]
+    >>> list(read_tsv_as_json_like(lines)) == [t.as_json_like for t in read_tsv(lines)]
+    True
+
+    Invalid dates are rejected, just like in read_tsv():
+
+    >>> list(read_tsv_as_json_like([lines[0].replace("20231231", "20231341", 1)]))
+    Traceback (most recent call last):
+      ...
+    ValueError: month must be in 1..12
+    """
+    for order, row in _read_rows(file):
+        description = rejoin_description(row.description)
+        yield {
+            "account": int(row.accountNumber),
+            "date": parse_yyyymmdd(row.transactiondate).isoformat(),
+            "order": order,
+            "currency": row.mutationcode,
+            "amount": decimal_format(parse_amount(row.amount)),
+            "start_saldo": decimal_format(parse_amount(row.startsaldo)),
+            "end_saldo": decimal_format(parse_amount(row.endsaldo)),
+            "description": description,
+            "desc": parse_description(description),
+        }
+
+
 def convert_tsv_to_json_like(filename):
     """Stupidly simple and easy-to-use function.
 
@@ -917,4 +1163,23 @@ def convert_tsv_to_json_like(filename):
     it, or making it better and making it work also for the other parsers.
     """
     with open(os.path.expanduser(filename)) as f:
-        return [r.as_json_like for r in read_tsv(f)]
+        return list(read_tsv_as_json_like(f))
+
+
+def write_tsv_as_ndjson(file, out):
+    """Converts a TSV file to newline-delimited JSON, one transaction per line.
+
+    Unlike convert_tsv_to_json_like(), each transaction is written to `out`
+    (a text file-like object) as soon as it is parsed, so the whole list is
+    never kept in memory.
+
+    >>> import io
+    >>> line = "\\t".join(["1", "EUR", "20231231", "1,00", "0,00", "20231231", "-1,00", "/TRTP/iDEAL/NAME/Foo"])
+    >>> out = io.StringIO()
+    >>> write_tsv_as_ndjson([line], out)
+    >>> print(out.getvalue(), end="")
+    {"account": 1, "amount": "-1.00", "currency": "EUR", "date": "2023-12-31", "desc": {"Naam": "Foo", "type": "SEPA iDEAL"}, "description": "/TRTP/iDEAL/NAME/Foo", "end_saldo": "0.00", "order": 1, "start_saldo": "1.00"}
+    """
+    for d in read_tsv_as_json_like(file):
+        out.write(json.dumps(d, sort_keys=True))
+        out.write("\n")
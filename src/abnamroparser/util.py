@@ -1,4 +1,6 @@
+import functools
 from dataclasses import dataclass
+from decimal import Context, Decimal, InvalidOperation, ROUND_HALF_EVEN
 from moneyed import Money
 
 
@@ -42,15 +44,15 @@ def filter_comments(iterable):
     ['first', 'second', 'last']
     """
     for line in iterable:
-        if line.lstrip().startswith("#"):
-            continue
-        if line.strip() == "":
+        stripped = line.lstrip()
+        # Empty (or whitespace-only) lines become an empty string.
+        if not stripped or stripped[0] == "#":
             continue
         yield line
 
 
 # Modified from https://stackoverflow.com/a/35513376
-def first(iterable, condition=lambda x: True, default=None):
+def first(iterable, condition=None, default=None):
     """Returns the first item in the `iterable` that satisfies the `condition`.
 
     If the condition is not given, returns the first item of the iterable.
@@ -61,10 +63,68 @@ def first(iterable, condition=lambda x: True, default=None):
     3
     >>> first([]) is None
     True
+    >>> first([0, 1])
+    0
     >>> first([1, 2, 3], lambda x: x > 5, -1)
     -1
     """
-    return next((x for x in iterable if condition(x)), default)
+    if condition is None:
+        return next(iter(iterable), default)
+    # filter() runs the loop in C, which is faster than a generator expression.
+    return next(filter(condition, iterable), default)
+
+
+_CENTS = Decimal("0.01")
+# Fixed context, so the result doesn't depend on the precision of the caller's context.
+_CENTS_CONTEXT = Context(prec=100, rounding=ROUND_HALF_EVEN)
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_cents(amount, signed):
+    """Formats a Decimal amount with two decimal places.
+
+    The same amounts show up over and over again (fees, subscriptions, zero
+    balances), so caching is worth it. `signed` is part of the cache key
+    because Decimal("-0") == Decimal("0"), but they are formatted differently.
+
+    >>> _format_cents(Decimal("0"), False), _format_cents(Decimal("-0"), True)
+    ('0.00', '-0.00')
+    >>> _format_cents(Decimal("1e30"), False)
+    '1000000000000000000000000000000.00'
+    >>> _format_cents(Decimal("-Infinity"), True)
+    '-Infinity'
+    >>> _format_cents(Decimal("1e200"), False) == "1" + "0" * 200 + ".00"
+    True
+    """
+    try:
+        # Same result as "{:.2f}".format(amount) under the default context.
+        return str(amount.quantize(_CENTS, context=_CENTS_CONTEXT))
+    except InvalidOperation:
+        # Infinity, or too many digits for the context.
+        return "{:.2f}".format(amount)
+
+
+def decimal_format(d: Decimal):
+    """Same as money_format(), but for a plain Decimal amount.
+
+    Useful when the amount was never wrapped into a moneyed.Money object.
+
+    >>> decimal_format(Decimal("-1234.5"))
+    '-1234.50'
+    >>> decimal_format(Decimal("0.001"))
+    '0.00'
+
+    The cached result must not depend on the context of the first caller:
+
+    >>> from decimal import localcontext
+    >>> with localcontext() as ctx:
+    ...     ctx.prec = 5
+    ...     decimal_format(Decimal("12345.67")), decimal_format(Decimal("9876.545"))
+    ('12345.67', '9876.54')
+    >>> decimal_format(Decimal("12345.67")), decimal_format(Decimal("9876.545"))
+    ('12345.67', '9876.54')
+    """
+    return _format_cents(d, d.is_signed())
 
 
 def money_format(m: Money):
@@ -80,6 +140,12 @@ def money_format(m: Money):
     '0.00'
     >>> money_format(Money("0.012", "EUR"))
     '0.01'
+    >>> money_format(Money("0.125", "EUR"))
+    '0.12'
+    >>> money_format(Money("0.135", "EUR"))
+    '0.14'
+    >>> money_format(Money("-12.3", "EUR"))
+    '-12.30'
     >>> money_format(Money("0.99", "EUR"))
     '0.99'
     >>> money_format(Money("1", "EUR"))
@@ -91,4 +157,4 @@ def money_format(m: Money):
     >>> money_format(Money("1234567.89", "EUR"))
     '1234567.89'
     """
-    return "{:.2f}".format(m.amount)
+    return decimal_format(m.amount)